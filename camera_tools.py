@@ -1,9 +1,18 @@
 import maya.cmds as mc
 import math
+import os
+import sys
 from maya import OpenMayaUI as omui
 from shiboken2 import wrapInstance
 from PySide2 import QtCore, QtWidgets
 
+# marker attribute added on every node created by the tool, used by cleanup_scene
+TAG_ATTR = 'AM_cameraTools'
+
+# utility nodes created per camera by create_camera_node, prefix of the node name
+LEGACY_NODE_PREFIXES = ('multiplyDivide_aperture_', 'multiplyDivide_base_', 'multiplyDivide_focal_',
+                        'plusMinusAverage_near_')
+
 
 def get_maya_window():
     mayaMainWindowPtr = omui.MQtUtil.mainWindow()
@@ -58,6 +67,7 @@ class LayoutTools(QtWidgets.QWidget):
         self.tools_tiers_btn = QtWidgets.QPushButton('Tiers')
         self.tools_fibonacciSpiral_btn = QtWidgets.QPushButton('FibonacciSpiral')
         self.tools_wd_btn = QtWidgets.QPushButton('WaveDestroyer')
+        self.tools_cleanup_btn = QtWidgets.QPushButton('Cleanup')
 
         self.help_curves_view_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
 
@@ -93,7 +103,7 @@ class LayoutTools(QtWidgets.QWidget):
         [self.near_layout.addWidget(w) for w in (self.near_lbl, self.near_dblSpb, self.near_slider)]
         [self.tools_layout.addWidget(w) for w in (self.tools_copy_btn, self.tools_paste_btn, self.tools_mpc_btn)]
         [self.tools_two_layout.addWidget(w) for w in
-         (self.tools_tiers_btn, self.tools_fibonacciSpiral_btn, self.tools_wd_btn)]
+         (self.tools_tiers_btn, self.tools_fibonacciSpiral_btn, self.tools_wd_btn, self.tools_cleanup_btn)]
 
         [self.main_layout.addLayout(l) for l in
          (self.camera_layout, self.focal_layout, self.near_layout, self.tools_layout, self.tools_two_layout)]
@@ -116,6 +126,7 @@ class LayoutTools(QtWidgets.QWidget):
         self.tools_tiers_btn.clicked.connect(self.ui_tiers)
         self.tools_fibonacciSpiral_btn.clicked.connect(self.ui_fibonacci_spiral)
         self.tools_wd_btn.clicked.connect(self.ui_wave_destroyer_inputdialog)
+        self.tools_cleanup_btn.clicked.connect(self.ui_cleanup)
 
     def setup_camera_callback(self):
         if not self.camera_cb.isChecked() and self.__sj_time_changed and self.__sj_selection_changed:
@@ -131,8 +142,7 @@ class LayoutTools(QtWidgets.QWidget):
             mc.scriptJob(k=self.__sj_time_changed, f=True)
             mc.scriptJob(k=self.__sj_selection_changed, f=True)
 
-        if mc.objExists('AM_cameraTools_grp'):
-            mc.delete('AM_cameraTools_grp')
+        cleanup_scene()
 
     def refresh(self):
         self.camera = get_camera()
@@ -181,6 +191,10 @@ class LayoutTools(QtWidgets.QWidget):
         if ok and key_value:
             wave_destroyer(key_value)
 
+    def ui_cleanup(self):
+        for node in cleanup_scene(legacy=True):
+            print('AM cameraTools cleanup, deleted: %s' % node)
+
 
 class Camera:
     def __init__(self, name, focal, near, panel):
@@ -228,13 +242,18 @@ class Camera:
             mc.parent(cam_grp, am_grp)
             mc.parentConstraint(self.name, cam_grp, maintainOffset=False)
 
+        # tag again in case the groups come from a scene saved before tagging
+        tag_node(am_grp, cam_grp, *mc.listRelatives(cam_grp, type='parentConstraint', path=True) or [])
+
         tiers_grp = self.name + '_tiers'
         if not mc.objExists(tiers_grp):
             mc.group(em=True, name=self.name + '_tiers')
+            tag_node(tiers_grp)
             mc.parent(tiers_grp, cam_grp)
             create_tiers(self.name, self.panel)
 
         else:
+            tag_node(tiers_grp)
             old_sel = mc.ls(selection=True)
             isolate_transform = []
             if mc.listRelatives(mc.ls(type='mesh'), path=True, parent=True):
@@ -266,12 +285,17 @@ class Camera:
             mc.parent(cam_grp, am_grp)
             mc.parentConstraint(self.name, cam_grp, maintainOffset=False)
 
+        # tag again in case the groups come from a scene saved before tagging
+        tag_node(am_grp, cam_grp, *mc.listRelatives(cam_grp, type='parentConstraint', path=True) or [])
+
         fibonacci_grp = self.name + '_fibonacci'
         if not mc.objExists(fibonacci_grp):
             mc.group(em=True, name=self.name + '_fibonacci')
             mc.parent(fibonacci_grp, cam_grp)
             create_fibonacci_curve(self.name, self.panel, 15, 16)
 
+        tag_node(fibonacci_grp)
+
 
 # get the current camera ,in this order, selection > sequencer > 2nd camera in list of all cams
 # send camera to camera Class
@@ -415,11 +439,15 @@ def wave_destroyer(key_value):
     mc.keyTangent(cam_focal_alpha, inTangentType='auto', outTangentType='auto')
 
     exp = '%s = tan(%s/100)' % (cam_focal, cam_focal_alpha)
-    mc.expression(s=exp)
+    exp_node = mc.expression(s=exp)
+    tag_node(exp_node)
 
     mc.bakeResults(cam_focal, simulation=True, time=(select_time[0], select_time[-1]), sampleBy=True,
                    preserveOutsideKeys=True, sparseAnimCurveBake=0)
 
+    if mc.objExists(exp_node):
+        mc.delete(exp_node)
+
     if store_start_keys:
         index = 0
         for k in store_start_keys:
@@ -484,6 +512,10 @@ def create_camera_node(camera, plane_for_cam):
         mc.connectAttr(camera + '.focalLength', multiplyDivide_focal_node + '.input2X')
         mc.connectAttr(camera + '.focalLength', multiplyDivide_focal_node + '.input2Y')
 
+    # tag again in case the nodes come from a scene saved before tagging
+
+    tag_node(*[n + camera for n in LEGACY_NODE_PREFIXES if mc.objExists(n + camera)])
+
     # connect plane_for_cam to camera
 
     mc.connectAttr('multiplyDivide_aperture_' + camera + '.outputZ', plane_for_cam + '.translateZ')
@@ -501,6 +533,7 @@ def create_tiers(camera, panel):
     right_crv = mc.curve(degree=1, p=[(0.25, 0.5, 0), (0.25, -0.5, 0)], name=camera + '_right_crv')
 
     for curves in top_crv, bottom_crv, left_crv, right_crv:
+        tag_node(curves)
         mc.parent(curves, tiers_grp)
 
     matrix_cam = mc.xform(camera, worldSpace=True, matrix=True, query=True)
@@ -576,6 +609,7 @@ def create_fibonacci_curve(camera, panel, iterations, points_per_section):
                    blendKnotInsertion=False, parameter=0.1)
     mc.delete(mc.listRelatives(all_curves[1:], parent=True))
     fibonacci_crv = mc.rename(mc.listRelatives(all_curves[0], parent=True), 'fibonacci')
+    tag_node(fibonacci_crv)
 
     matrix_cam = mc.xform(camera, worldSpace=True, matrix=True, query=True)
     mc.xform(fibonacci_grp, worldSpace=True, matrix=matrix_cam)
@@ -648,6 +682,122 @@ def gen_fib_points(ratio):
         cycle_cpt %= 4
 
 
+def tag_node(*nodes):
+    """Mark nodes as created by the tool so cleanup_scene can find them.
+
+    Args:
+        *nodes (str): maya nodes to tag
+    """
+    for node in nodes:
+        if not mc.attributeQuery(TAG_ATTR, node=node, exists=True):
+            mc.addAttr(node, longName=TAG_ATTR, attributeType='bool', defaultValue=True)
+
+
+def find_legacy_nodes():
+    """Find nodes created by the tool before tagging, by their known names.
+
+    Camera groups go with AM_cameraTools_grp. Camera nodes are only kept if
+    they are connected like create_camera_node does, to the camera or, when
+    the camera is gone, to each other.
+
+    Returns:
+        list: maya nodes
+    """
+    legacy = mc.ls('AM_cameraTools_grp', long=True) or []
+
+    for aperture in mc.ls('multiplyDivide_aperture_*', type='multiplyDivide') or []:
+        camera = aperture[len('multiplyDivide_aperture_'):]
+        base = 'multiplyDivide_base_' + camera
+        focal = 'multiplyDivide_focal_' + camera
+        near = 'plusMinusAverage_near_' + camera
+
+        base_ok = mc.objExists(base) and mc.isConnected(aperture + '.output', base + '.input2')
+        focal_ok = base_ok and mc.objExists(focal) and mc.isConnected(base + '.output', focal + '.input1')
+        near_ok = mc.objExists(near) and mc.isConnected(near + '.output1D', aperture + '.input1Z')
+        camera_ok = mc.objExists(camera + '.horizontalFilmAperture') and \
+            mc.isConnected(camera + '.horizontalFilmAperture', aperture + '.input1X')
+
+        if not camera_ok and not focal_ok:
+            continue
+
+        legacy.append(aperture)
+        legacy += [node for node, ok in ((base, base_ok), (focal, focal_ok), (near, near_ok)) if ok]
+
+    return legacy
+
+
+def cleanup_scene(legacy=False):
+    """Delete every node tagged by the tool in a single pass.
+
+    With legacy, untagged nodes from older scenes are also found with
+    find_legacy_nodes. Nodes from referenced files can't be deleted and are
+    skipped. Tagged dag nodes under a tagged parent are left to their parent's
+    deletion.
+
+    Args:
+        legacy (bool): also delete untagged nodes from older scenes
+
+    Returns:
+        list: deleted maya nodes
+    """
+    tagged = mc.ls('*.' + TAG_ATTR, objectsOnly=True, long=True, recursive=True) or []
+    if legacy:
+        tagged += find_legacy_nodes()
+    tagged = set(tagged)
+    tagged = [n for n in sorted(tagged) if not mc.referenceQuery(n, isNodeReferenced=True)]
+
+    # keep only the top most tagged dag paths, children go with them
+    tagged_paths = set(n for n in tagged if n.startswith('|'))
+    to_delete = []
+    for node in tagged:
+        parents = node.split('|')
+        if any('|'.join(parents[:i]) in tagged_paths for i in range(2, len(parents))):
+            continue
+        to_delete.append(node)
+
+    if to_delete:
+        mc.delete(to_delete)
+
+    return to_delete
+
+
+def cleanup_scenes(folder):
+    """Open every maya scene of a folder, run cleanup_scene and save it back.
+
+    Scenes are first opened without their references, referenced nodes are
+    not cleaned anyway. Only scenes with nodes to delete are opened again with
+    their references, so the saved file keeps its reference load state.
+    A scene failing to open is reported and skipped.
+
+    Args:
+        folder (str): folder with .ma/.mb scenes
+
+    Returns:
+        dict: scene path with the deleted nodes or the error message
+    """
+    report = {}
+    for scene in sorted(os.listdir(folder)):
+        if os.path.splitext(scene)[-1].lower() not in ('.ma', '.mb'):
+            continue
+
+        scene_path = os.path.join(folder, scene)
+        try:
+            mc.file(scene_path, open=True, force=True, prompt=False, loadReferenceDepth='none')
+            deleted = []
+            if mc.ls('*.' + TAG_ATTR, objectsOnly=True, recursive=True) or find_legacy_nodes():
+                mc.file(scene_path, open=True, force=True, prompt=False)
+                deleted = cleanup_scene(legacy=True)
+            if deleted:
+                mc.file(save=True, force=True)
+        except RuntimeError as e:
+            report[scene_path] = 'failed: %s' % str(e).strip()
+            continue
+
+        report[scene_path] = '%d node(s) deleted%s' % (len(deleted), ''.join('\n    ' + n for n in deleted))
+
+    return report
+
+
 def launch():
     if mc.window(LayoutTools.OBJECT_NAME, q=True, exists=True):
         mc.deleteUI(LayoutTools.OBJECT_NAME)
@@ -657,4 +807,17 @@ def launch():
     return lt
 
 
-launch()
+# headless cleanup over a folder of scenes: mayapy camera_tools.py /path/to/scenes
+
+if __name__ == '__main__' and len(sys.argv) > 1:
+    if not os.path.isdir(sys.argv[1]):
+        sys.exit('not a folder: %s' % sys.argv[1])
+
+    import maya.standalone
+    maya.standalone.initialize()
+    for scene_path, result in sorted(cleanup_scenes(sys.argv[1]).items()):
+        print('%s: %s' % (scene_path, result))
+    maya.standalone.uninitialize()
+
+else:
+    launch()